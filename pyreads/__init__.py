@@ -1,8 +1,8 @@
 """PyReads package."""
 
-from .core import fetch_library
+from .core import fetch_library, fetch_library_async
 from .models import Book, Library
 
 __version__ = "0.3.4"
 __author__ = "Jeremy Kazimer"
-__all__ = ["Book", "Library", "fetch_library"]
+__all__ = ["Book", "Library", "fetch_library", "fetch_library_async"]
@@ -1,25 +1,90 @@
 """Internal HTTP utilities for PyReads."""
 
-from httpx import Client, HTTPStatusError
+from asyncio import to_thread
+from hashlib import sha256
+from os import environ
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from time import time
+
+from httpx import AsyncClient, Client, HTTPStatusError, Response
 
 from ._parser import _parse_books_from_html
 from .models import Book
 
 
+def _default_cache_dir() -> Path:
+    """
+    Returns the pyreads directory under $XDG_CACHE_HOME, falling back to
+    ~/.cache when the variable is unset or empty.
+    """
+    cache_home = environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "pyreads"
+
+
+_CACHE_DIR = _default_cache_dir()
+
+_CACHE_TTL = 3600
+
+
 def _format_goodreads_url(user_id: int, page: int = 1) -> str:
     """
-    Returns the Goodreads shelf URL for a given user and page.
+    Returns the Goodreads shelf URL for a given user and page, requesting the
+    maximum of 100 reviews per page to minimise the number of pages fetched.
     """
-    return f"https://www.goodreads.com/review/list/{user_id}?page={page}&shelf=read"
+    return (
+        f"https://www.goodreads.com/review/list/{user_id}"
+        f"?page={page}&shelf=read&per_page=100"
+    )
 
 
-def _fetch_html(client: Client, url: str) -> str:
+def _cache_path(url: str) -> Path:
     """
-    Sends a GET request and returns the response text
+    Returns the on-disk cache file for a URL.
+    """
+    return _CACHE_DIR / f"{sha256(url.encode()).hexdigest()}.html"
+
+
+def _read_cached_html(url: str) -> bytes | None:
+    """
+    Returns the cached HTML for a URL, or None if missing or expired.
+
+    The file may be replaced or removed by another process at any point, so
+    a disappearance between the stat and the read is also treated as a miss.
+    """
+    path = _cache_path(url)
+    try:
+        expired = time() - path.stat().st_mtime >= _CACHE_TTL
+        html = None if expired else path.read_bytes()
+    except FileNotFoundError:
+        return None
+    return html
+
+
+def _write_cached_html(url: str, html: bytes) -> None:
+    """
+    Stores the HTML for a URL in the on-disk cache, replacing it atomically
+    so concurrent readers never see a partial file. The temporary file is
+    removed if either step fails.
+    """
+    path = _cache_path(url)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with NamedTemporaryFile(dir=path.parent, delete=False) as tmp:
+        tmp_path = Path(tmp.name)
+    try:
+        tmp_path.write_bytes(html)
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _response_content(response: Response) -> bytes:
+    """
+    Returns the raw response body, raising on any non-200 status.
     """
-    response = client.get(url)
     if response.status_code == 200:
-        return response.text
+        return response.content
 
     err = f"{response.status_code} Error: {response.url}"
     raise HTTPStatusError(
@@ -27,10 +92,62 @@ def _fetch_html(client: Client, url: str) -> str:
     )
 
 
-def _fetch_books_page(client: Client, user_id: int, page: int) -> list[Book]:
+def _fetch_html(client: Client, url: str, cache: bool = False) -> bytes:
     """
-    Fetches a single Goodreads page and parses books from HTML.
+    Sends a GET request and returns the raw response body, reading and writing
+    the on-disk cache when `cache` is set.
+    """
+    if cache and (html := _read_cached_html(url)) is not None:
+        return html
+    html = _response_content(client.get(url))
+    if cache:
+        _write_cached_html(url, html)
+    return html
+
+
+async def _fetch_html_async(
+    client: AsyncClient, url: str, cache: bool = False
+) -> bytes:
+    """
+    Sends an asynchronous GET request and returns the raw response body,
+    reading and writing the on-disk cache when `cache` is set. Cache file
+    access runs in a worker thread so it never blocks the event loop.
+    """
+    if cache and (html := await to_thread(_read_cached_html, url)) is not None:
+        return html
+    html = _response_content(await client.get(url))
+    if cache:
+        await to_thread(_write_cached_html, url, html)
+    return html
+
+
+def _fetch_page_html(
+    client: Client, user_id: int, page: int, cache: bool = False
+) -> bytes:
+    """
+    Fetches the raw HTML of a single Goodreads page.
     """
     url = _format_goodreads_url(user_id, page)
-    html = _fetch_html(client, url)
+    return _fetch_html(client, url, cache)
+
+
+def _fetch_books_page(
+    client: Client, user_id: int, page: int, cache: bool = False
+) -> list[Book]:
+    """
+    Fetches a single Goodreads page and parses books from HTML.
+    """
+    html = _fetch_page_html(client, user_id, page, cache)
     return _parse_books_from_html(html)
+
+
+async def _fetch_books_page_async(
+    client: AsyncClient, user_id: int, page: int, cache: bool = False
+) -> list[Book]:
+    """
+    Fetches a single Goodreads page asynchronously and parses books from HTML
+    in a worker thread, so parsing does not block the event loop.
+    """
+    url = _format_goodreads_url(user_id, page)
+    html = await _fetch_html_async(client, url, cache)
+    return await to_thread(_parse_books_from_html, html)
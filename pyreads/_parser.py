@@ -3,58 +3,109 @@
 from __future__ import annotations
 
 import re
-from abc import ABC, abstractmethod
-from datetime import UTC, datetime
-from typing import Any, override
+from datetime import date
+from functools import lru_cache
+from sys import intern
+from types import MappingProxyType
+from typing import Any
 from warnings import warn
 
-from bs4 import BeautifulSoup
-from bs4.element import PageElement, Tag
+from lxml.etree import XPath
+from lxml.html import HtmlElement, HTMLParser, fromstring
 from pydantic import ValidationError
 
 from .models import Book, _Series
 
 # --- Constants ----------------------------------------------------------------
 
-_REVIEW_ID_PATTERN = re.compile(r"^freeTextContainerreview")
-
 _PAGE_NUMBER_PATTERN = re.compile(r"(\d{1,6})(?=\D|$)")
 
-_SERIES_PATTERNS = [
-    re.compile(r"\((.*?)(?:,\s*|\s+)#(\d+(?:\.\d+)?)\)"),
-    re.compile(r"^(.*?)(?:,)?\s*Vol\.\s*(\d+(?:\.\d+)?)\b"),
-    re.compile(r"\((.*?)\s+Book\s+(\d+(?:\.\d+)?)\)"),
-]
-
-_DATE_FORMATS = ("%b %d, %Y", "%b %Y")
-
-_STRING_TO_RATING = {
-    "did not like it": 1,
-    "it was ok": 2,
-    "liked it": 3,
-    "really liked it": 4,
-    "it was amazing": 5,
-}
+# ASCII digits only: str.isdigit also accepts digits such as "²" that int()
+# rejects.
+_DIGITS_PATTERN = re.compile(r"[0-9]+")
+
+# Alternatives are tried in order: "(Name, #1)", "Name, Vol. 1" and
+# "(Name Book 1)". Each contributes a (name, entry) group pair.
+_SERIES_PATTERN = re.compile(
+    r"\((.*?)(?:,\s*|\s+)#(\d+(?:\.\d+)?)\)"
+    r"|(.*?)(?:,)?\s*Vol\.\s*(\d+(?:\.\d+)?)\b"
+    r"|\((.*?)\s+Book\s+(\d+(?:\.\d+)?)\)"
+)
+
+# Spelled out rather than taken from strptime's %b or calendar.month_abbr,
+# both of which follow the current locale.
+_MONTHS = MappingProxyType(
+    {
+        "Jan": 1,
+        "Feb": 2,
+        "Mar": 3,
+        "Apr": 4,
+        "May": 5,
+        "Jun": 6,
+        "Jul": 7,
+        "Aug": 8,
+        "Sep": 9,
+        "Oct": 10,
+        "Nov": 11,
+        "Dec": 12,
+    }
+)
+
+# Goodreads always emits these star titles in lowercase, so they are looked up
+# verbatim.
+_STRING_TO_RATING = MappingProxyType(
+    {
+        "did not like it": 1,
+        "it was ok": 2,
+        "liked it": 3,
+        "really liked it": 4,
+        "it was amazing": 5,
+    }
+)
 
-# --- Helpers ------------------------------------------------------------------
+# --- XPath expressions --------------------------------------------------------
 
 
-def _safe_find_text(
-    element: Tag | PageElement | None, strip: bool = True
-) -> str | None:
+def _has_class(name: str) -> str:
     """
-    Safely extract text from an element, returning None if element is
-    None/empty.
+    Return an XPath predicate matching elements whose class list contains
+    `name`.
     """
-    return element.get_text(strip=strip) or None if element else None
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+_XPATH_REVIEW_ROWS = XPath('//tr[starts-with(@id, "review_")]')
+
+_XPATH_PAGE_LINKS = XPath('//div[@id="reviewPagination"]//a/text()')
+
+# The expressions below are evaluated relative to a single <td> cell.
+
+_XPATH_FIRST_LINK = XPath("(.//a)[1]")
+
+_XPATH_DATE = XPath(f"(.//span[{_has_class('date_read_value')}])[1]")
+
+_XPATH_DATE_FALLBACK = XPath("(.//span[@title])[1]")
 
+_XPATH_PAGES = XPath("(.//nobr)[1]")
 
-def _get_field_cell(row: Tag, field_name: str) -> Tag | None:
+_XPATH_RATING_TITLE = XPath(f"(.//span[{_has_class('staticStars')}])[1]/@title")
+
+_XPATH_REVIEW = XPath(
+    '(.//span[starts-with(@id, "freeTextContainerreview")])[1]'
+)
+
+# Evaluated relative to the title link found by _XPATH_FIRST_LINK.
+_XPATH_SERIES = XPath(f".//span[{_has_class('darkGreyText')}]")
+
+# --- Helpers ------------------------------------------------------------------
+
+
+def _first_text(elements: list[HtmlElement]) -> str | None:
     """
-    Return the <td class='field {field_name}'> cell, or None if not present.
+    Return the stripped text of the first matched element, or None if nothing
+    matched or the text is empty.
     """
-    el = row.find("td", class_=f"field {field_name}")
-    return el if isinstance(el, Tag) else None
+    return elements[0].text_content().strip() or None if elements else None
 
 
 def _extract_number(text: str | None, pattern: re.Pattern[str]) -> int | None:
@@ -68,300 +119,207 @@ def _extract_number(text: str | None, pattern: re.Pattern[str]) -> int | None:
     return int(m.group(1)) if m else None
 
 
-# --- Parser base --------------------------------------------------------------
+# --- Transforms ---------------------------------------------------------------
 
 
-class _Parser(ABC):
-    """
-    Abstract base class for all field parsers.
+@lru_cache(maxsize=4096)
+def _parse_date(text: str) -> date | None:
     """
+    Parse a Goodreads date string such as "Dec 14, 2009" or "Dec 2009".
 
-    @classmethod
-    def parse(cls, row: Tag) -> Any | None:
-        """Extract a value from a Goodreads review table row.
-
-        Args:
-            row: The BS4 Tag to extract information from.
-
-        Returns:
-            Value from the tag, or None if no value found.
-        """
-        # Step 1: Extract HTML element
-        element = cls._extract_element(row)
-        if element is None:
-            return None
-
-        # Step 2: Extract raw data from element
-        data = cls._extract_data(element)
-        if data is None:
+    Month-only dates resolve to the first of the month. Like strptime's %b,
+    %d and %Y, month names are case-insensitive, the day must be one or two
+    digits and the year exactly four.
+    Date strings repeat heavily across a library, so results are memoized
+    for the lifetime of the process.
+    """
+    match text.split():
+        case [month, day, year] if day.endswith(","):
+            day = day[:-1]
+        case [month, year]:
+            day = "1"
+        case _:
             return None
 
-        # Step 3: Transform data into final form
-        return cls._transform_data(data)
-
-    @staticmethod
-    @abstractmethod
-    def _extract_element(row: Tag) -> Tag | None:
-        """Extract the relevant HTML element(s) from the row.
-
-        Args:
-            row: The BS4 Tag to extract elements from.
-
-        Returns:
-            The extracted element(s) as Tag or None if not found.
-        """
-        raise NotImplementedError
-
-    @staticmethod
-    @abstractmethod
-    def _extract_data(element: Tag) -> str | None:
-        """Extract raw data from the element(s).
-
-        Args:
-            element: The element to extract data from (always a Tag).
-
-        Returns:
-            The extracted raw data as string or None if not found.
-        """
-        raise NotImplementedError
-
-    @staticmethod
-    def _transform_data(data: str) -> Any:
-        """Transform the raw data into the final form.
-
-        Args:
-            data: The raw data to transform (always a string).
-
-        Returns:
-            The transformed data in the appropriate type.
-        """
-
-        return data
-
-
-# --- Concrete parsers ---------------------------------------------------------
+    month_number = _MONTHS.get(month.title())
+    if (
+        month_number is None
+        or len(day) > 2
+        or not _DIGITS_PATTERN.fullmatch(day)
+        or len(year) != 4
+        or not _DIGITS_PATTERN.fullmatch(year)
+    ):
+        return None
+    try:
+        return date(int(year), month_number, int(day))
+    except ValueError:
+        return None
 
 
-class _AuthorParser(_Parser):
+@lru_cache(maxsize=2048)
+def _parse_series(text: str) -> _Series | None:
     """
-    Extract author name from review row.
-    """
-
-    @staticmethod
-    @override
-    def _extract_element(row: Tag) -> Tag | None:
-        return _get_field_cell(row, "author")
-
-    @staticmethod
-    @override
-    def _extract_data(element: Tag) -> str | None:
-        link = element.find("a")
-        return _safe_find_text(link) if link else None
-
+    Parse series text such as "(Series Name, #1)" or "Series Name, Vol. 2".
 
-class _DateParser(_Parser):
+    Series strings repeat across a library through rereads and duplicate
+    editions, so results are memoized like dates. Callers only read the
+    returned series, so sharing it between rows is safe.
     """
-    Extract and parse date read from review row.
-    """
-
-    @staticmethod
-    @override
-    def _extract_element(row: Tag) -> Tag | None:
-        return _get_field_cell(row, "date_read")
-
-    @staticmethod
-    @override
-    def _extract_data(element: Tag) -> str | None:
-        span = element.find("span", class_="date_read_value") or element.find(
-            "span", title=True
-        )
-        return _safe_find_text(span)
-
-    @staticmethod
-    @override
-    def _transform_data(data: str) -> Any:
-        for fmt in _DATE_FORMATS:
-            try:
-                dt = datetime.strptime(data, fmt).replace(tzinfo=UTC)
-                return dt.date()
-            except ValueError:
-                continue
+    match = _SERIES_PATTERN.match(text)
+    if not match or match.lastindex is None:
+        return None
+    # The entry group closes last, so it identifies the matched alternative
+    name, entry = match.group(match.lastindex - 1, match.lastindex)
+    if not (name := name.strip()):
         return None
+    return _Series(intern(name), float(entry))
 
 
-class _PageNumberParser(_Parser):
+def _parse_title(link: HtmlElement) -> str | None:
     """
-    Extract number of pages from review row.
+    Return the title text of the title link, ignoring the trailing series
+    span when present.
     """
+    if link.text is not None:
+        return link.text.strip()
+    return link.text_content().strip() or None
 
-    @staticmethod
-    @override
-    def _extract_element(row: Tag) -> Tag | None:
-        return _get_field_cell(row, "num_pages")
-
-    @staticmethod
-    @override
-    def _extract_data(element: Tag) -> str | None:
-        nobr = element.find("nobr")
-        return _safe_find_text(nobr, strip=True)
 
-    @staticmethod
-    @override
-    def _transform_data(data: str) -> Any:
-        return _extract_number(data, _PAGE_NUMBER_PATTERN)
+# --- Row parsing --------------------------------------------------------------
 
 
-class _RatingParser(_Parser):
+def _parse_row(row: HtmlElement) -> dict[str, Any]:
     """
-    Extract user rating from review row.
-    """
-
-    @staticmethod
-    @override
-    def _extract_element(row: Tag) -> Tag | None:
-        return _get_field_cell(row, "rating")
-
-    @staticmethod
-    @override
-    def _extract_data(element: Tag) -> str | None:
-        span = element.find("span", class_="staticStars")
-        title = span.get("title") if isinstance(span, Tag) else None
-        return title if isinstance(title, str) else None
+    Helper function which parses row into attribute dictionary.
 
-    @staticmethod
-    @override
-    def _transform_data(data: str) -> Any:
-        rating = _STRING_TO_RATING.get(data.lower())
-        return int(rating) if rating is not None else None
+    The row's cells are walked once, dispatching on each cell's class rather
+    than searching the whole row again for every field. The walk stops at a
+    title cell without a title, since the row cannot become a Book.
 
+    Args:
+        row: The <tr> element which contains the data.
 
-class _ReviewParser(_Parser):
-    """
-    Extract review text from review row.
+    Returns:
+        Dictionary mapping attribute name to value.
     """
+    attributes: dict[str, Any] = dict.fromkeys(
+        (
+            "authorName",
+            "dateRead",
+            "numberOfPages",
+            "userRating",
+            "userReview",
+            "title",
+            "series",
+        )
+    )
+
+    for td in row.iterchildren("td"):
+        match td.get("class"):
+            case "field author":
+                # Authors repeat across a library, so one copy is kept
+                author = _first_text(_XPATH_FIRST_LINK(td))
+                attributes["authorName"] = intern(author) if author else None
+            case "field date_read":
+                date_text = _first_text(_XPATH_DATE(td)) or _first_text(
+                    _XPATH_DATE_FALLBACK(td)
+                )
+                attributes["dateRead"] = (
+                    _parse_date(date_text) if date_text else None
+                )
+            case "field num_pages":
+                attributes["numberOfPages"] = _extract_number(
+                    _first_text(_XPATH_PAGES(td)), _PAGE_NUMBER_PATTERN
+                )
+            case "field rating":
+                rating_title = _XPATH_RATING_TITLE(td)
+                attributes["userRating"] = (
+                    _STRING_TO_RATING.get(rating_title[0])
+                    if rating_title
+                    else None
+                )
+            case "field review":
+                attributes["userReview"] = _first_text(_XPATH_REVIEW(td))
+            case "field title":
+                title_links = _XPATH_FIRST_LINK(td)
+                title = _parse_title(title_links[0]) if title_links else None
+                if title is None:
+                    # Such a row is rejected anyway, and Goodreads puts the
+                    # title before every other field, so stop walking it
+                    break
+                attributes["title"] = title
+                # The series span lives inside the title link, so it is
+                # searched for from the link rather than the whole cell
+                series_text = _first_text(_XPATH_SERIES(title_links[0]))
+                attributes["series"] = (
+                    _parse_series(series_text) if series_text else None
+                )
 
-    @staticmethod
-    @override
-    def _extract_element(row: Tag) -> Tag | None:
-        element = row.find("span", {"id": _REVIEW_ID_PATTERN})
-        return element if isinstance(element, Tag) else None
+    if series := attributes["series"]:
+        attributes["seriesName"] = series.name
+        attributes["seriesEntry"] = series.entry
 
-    @staticmethod
-    @override
-    def _extract_data(element: Tag) -> str | None:
-        return _safe_find_text(element)
+    return attributes
 
 
-class _SeriesParser(_Parser):
+def _parse_books_from_document(doc: HtmlElement) -> list[Book]:
     """
-    Extract series information from review row.
-    """
-
-    @staticmethod
-    @override
-    def _extract_element(row: Tag) -> Tag | None:
-        cell = _get_field_cell(row, "title")
-        if not cell:
-            return None
-
-        link = cell.find("a")
-        if not isinstance(link, Tag):
-            return None
+    Returns the Book objects for every review row of a parsed shelf page.
 
-        return link
-
-    @staticmethod
-    @override
-    def _extract_data(element: Tag) -> str | None:
-        series_span = element.find("span", class_="darkGreyText")
-        return _safe_find_text(series_span, strip=True)
-
-    @staticmethod
-    @override
-    def _transform_data(data: str) -> Any:
-        for pattern in _SERIES_PATTERNS:
-            if match := pattern.match(data):
-                return _Series(
-                    name=match.group(1).strip(),
-                    entry=match.group(2),
-                )
-        return None
+    Rows are validated into Books as usual. When Python runs with -O, full
+    validation is skipped in favour of `Book.model_construct`, since the
+    parsers already produce correctly typed values. Rows missing a title or
+    author are skipped with the same warning either way.
+    """
+    books = []
+    for tr in _XPATH_REVIEW_ROWS(doc):
+        attributes = _parse_row(tr)
+        if attributes["title"] is None or attributes["authorName"] is None:
+            warn(f"Missing title or author in {tr.get('id')}", stacklevel=1)
+            continue
+        if __debug__:
+            try:
+                book = Book.model_validate(attributes)
+            except ValidationError as exc:
+                warn(str(exc), stacklevel=1)
+                continue
+        else:
+            book = Book.model_construct(**attributes)
+        books.append(book)
+    return books
 
 
-class _TitleParser(_Parser):
+def _parse_total_pages(doc: HtmlElement) -> int:
     """
-    Extract book title from review row.
+    Returns the number of shelf pages listed in the pagination of a parsed
+    shelf page, or 1 if the page has no pagination.
     """
+    page_numbers = [
+        int(text)
+        for text in _XPATH_PAGE_LINKS(doc)
+        if _DIGITS_PATTERN.fullmatch(text)
+    ]
+    return max(page_numbers, default=1)
 
-    @staticmethod
-    @override
-    def _extract_element(row: Tag) -> Tag | None:
-        cell = _get_field_cell(row, "title")
-        if not cell:
-            return None
-
-        link = cell.find("a")
-        if not isinstance(link, Tag):
-            return None
-
-        return link
 
-    @staticmethod
-    @override
-    def _extract_data(element: Tag) -> str | None:
-        if element.contents and isinstance(element.contents[0], str):
-            return element.contents[0].strip()
-        return element.get_text(strip=True) or None
-
-
-def _parse_row(row: Tag) -> dict[str, Any]:
+def _parse_html(html: bytes) -> HtmlElement:
     """
-    Helper function which parses row into attribute dictionary.
-
-    Args:
-        row: The row which contains the data.
-
-    Returns:
-        Dictionary mapping attribute name to value.
+    Parses raw Goodreads HTML, which is always served as UTF-8.
     """
+    return fromstring(html, parser=HTMLParser(encoding="utf-8"))
 
-    parsers: dict[str, type[_Parser]] = {
-        "authorName": _AuthorParser,
-        "dateRead": _DateParser,
-        "numberOfPages": _PageNumberParser,
-        "userRating": _RatingParser,
-        "userReview": _ReviewParser,
-        "title": _TitleParser,
-        "series": _SeriesParser,
-    }
-
-    attributes: dict[str, Any] = {}
-
-    for attribute, parser in parsers.items():
-        value = parser.parse(row)
-        if attribute == "series" and value:
-            assert isinstance(value, _Series)
-            attributes["seriesName"] = value.name
-            attributes["seriesEntry"] = value.entry
-        attributes[attribute] = value
 
-    return attributes
+def _parse_books_from_html(html: bytes) -> list[Book]:
+    """
+    Parses raw Goodreads shelf HTML and returns a list of Book objects.
+    """
+    return _parse_books_from_document(_parse_html(html))
 
 
-def _parse_books_from_html(html: str) -> list[Book]:
+def _parse_first_page(html: bytes) -> tuple[list[Book], int]:
     """
-    Parses Goodreads shelf HTML and returns a list of Book objects.
+    Parses the first shelf page once, returning both its books and the total
+    number of shelf pages.
     """
-    soup = BeautifulSoup(html, "html.parser")
-    review_trs = soup.find_all("tr", id=re.compile(r"^review_"))
-    books = []
-    for tr in review_trs:
-        assert isinstance(tr, Tag)
-        attributes = _parse_row(tr)
-        try:
-            book = Book.model_validate(attributes)
-        except ValidationError as exc:
-            warn(str(exc), stacklevel=1)
-        else:
-            books.append(book)
-    return books
+    doc = _parse_html(html)
+    return _parse_books_from_document(doc), _parse_total_pages(doc)
@@ -1,15 +1,25 @@
 """Core functionality for PyReads, which includes fetching a user's library."""
 
 import concurrent.futures
+from asyncio import Semaphore, to_thread
+from functools import partial
+from itertools import chain
 from os import cpu_count
 
-from bs4 import BeautifulSoup
-from httpx import Client
+from httpx import AsyncClient, Client, Limits
 from tqdm import tqdm
+from tqdm.asyncio import tqdm_asyncio
 
-from ._http import _fetch_books_page, _fetch_html, _format_goodreads_url
-from ._parser import _parse_books_from_html
-from .models import Library
+from ._http import (
+    _fetch_books_page,
+    _fetch_books_page_async,
+    _fetch_html,
+    _fetch_html_async,
+    _fetch_page_html,
+    _format_goodreads_url,
+)
+from ._parser import _parse_books_from_html, _parse_first_page
+from .models import Book, Library
 
 _DEFAULT_HEADERS = {
     "User-Agent": (
@@ -19,12 +29,20 @@ _DEFAULT_HEADERS = {
     )
 }
 
+_MIN_PAGES_FOR_PROCESSES = 8
+
+_DEFAULT_LIMITS = Limits(
+    max_connections=32, max_keepalive_connections=32, keepalive_expiry=30
+)
+
 
 def fetch_library(
     user_id: int,
     headers: dict[str, str] = _DEFAULT_HEADERS,
     workers: int | None = None,
     show_progress: bool = True,
+    processes: int | None = None,
+    cache: bool = False,
 ) -> Library:
     """
     Fetches the complete Goodreads library for a user.
@@ -34,45 +52,123 @@ def fetch_library(
         headers: Optional request headers.
         workers: Number of workers to use to complete task.
         show_progress: Whether or not to show TQDM progress.
+        processes: Number of processes used to parse pages of libraries with
+            more than 8 pages. When None, pages are parsed in the fetching
+            threads instead.
+        cache: Whether to reuse pages fetched within the last hour from
+            $XDG_CACHE_HOME/pyreads (~/.cache/pyreads by default) instead
+            of requesting them again.
 
     Returns:
         Library: A Library object containing all books read by the user.
     """
 
-    books = []
-    with Client(headers=headers, follow_redirects=True, timeout=60) as client:
+    with Client(
+        headers=headers,
+        follow_redirects=True,
+        timeout=60,
+        http2=True,
+        limits=_DEFAULT_LIMITS,
+    ) as client:
         # Fetch first page
         first_url = _format_goodreads_url(user_id, 1)
-        first_html = _fetch_html(client, first_url)
-        books += _parse_books_from_html(first_html)
-
-        soup = BeautifulSoup(first_html, "html.parser")
-        pagination_div = soup.find("div", id="reviewPagination")
-        page_links = (
-            pagination_div.find_all("a")
-            if pagination_div and hasattr(pagination_div, "find_all")
-            else []
+        first_html = _fetch_html(client, first_url, cache)
+        first_books, total_pages = _parse_first_page(first_html)
+
+        # Only pay the process start-up cost when it is amortized
+        parse_in_processes = (
+            processes is not None and total_pages > _MIN_PAGES_FOR_PROCESSES
+        )
+        fetch_page = (
+            _fetch_page_html if parse_in_processes else _fetch_books_page
         )
-        page_numbers = [int(a.text) for a in page_links if a.text.isdigit()]
-        total_pages = max(page_numbers) if page_numbers else 1
 
         # Fetch remaining pages concurrently
         cpus = cpu_count() or 1
         with concurrent.futures.ThreadPoolExecutor(
             max_workers=workers or min(32, cpus * 5)
         ) as executor:
-            futures = [
-                executor.submit(_fetch_books_page, client, user_id, page)
-                for page in range(2, total_pages + 1)
-            ]
-            for future in tqdm(
-                concurrent.futures.as_completed(futures),
-                position=0,
-                leave=True,
-                total=len(futures),
-                desc="Fetching pages",
-                disable=not show_progress,
-            ):
-                books += future.result()
+            fetch = partial(fetch_page, client, user_id, cache=cache)
+            pages = list(
+                tqdm(
+                    executor.map(fetch, range(2, total_pages + 1)),
+                    position=0,
+                    leave=True,
+                    total=total_pages - 1,
+                    desc="Fetching pages",
+                    disable=not show_progress,
+                )
+            )
+
+    if parse_in_processes:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=processes
+        ) as executor:
+            pages = list(
+                executor.map(_parse_books_from_html, pages, chunksize=4)
+            )
+
+    books = list(chain(first_books, chain.from_iterable(pages)))
+    return Library(userId=user_id, books=books)
+
+
+async def fetch_library_async(
+    user_id: int,
+    headers: dict[str, str] = _DEFAULT_HEADERS,
+    workers: int | None = None,
+    show_progress: bool = True,
+    cache: bool = False,
+) -> Library:
+    """
+    Fetches the complete Goodreads library for a user asynchronously.
+
+    Pages are requested concurrently over a single connection pool, and each
+    page is parsed in a worker thread so the event loop is never blocked.
 
+    Args:
+        user_id: Goodreads user ID.
+        headers: Optional request headers.
+        workers: Maximum number of pages requested at once. Defaults to the
+            connection pool size.
+        show_progress: Whether or not to show TQDM progress.
+        cache: Whether to reuse pages fetched within the last hour from
+            $XDG_CACHE_HOME/pyreads (~/.cache/pyreads by default) instead
+            of requesting them again.
+
+    Returns:
+        Library: A Library object containing all books read by the user.
+    """
+
+    async with AsyncClient(
+        headers=headers,
+        follow_redirects=True,
+        timeout=60,
+        http2=True,
+        limits=_DEFAULT_LIMITS,
+    ) as client:
+        # Fetch first page
+        first_url = _format_goodreads_url(user_id, 1)
+        first_html = await _fetch_html_async(client, first_url, cache)
+        first_books, total_pages = await to_thread(
+            _parse_first_page, first_html
+        )
+
+        # Fetch remaining pages concurrently, keeping requests that are still
+        # waiting on a connection from timing out in the pool
+        semaphore = Semaphore(workers or _DEFAULT_LIMITS.max_connections)
+
+        async def fetch(page: int) -> list[Book]:
+            async with semaphore:
+                return await _fetch_books_page_async(
+                    client, user_id, page, cache
+                )
+
+        results = await tqdm_asyncio.gather(
+            *(fetch(page) for page in range(2, total_pages + 1)),
+            position=0,
+            leave=True,
+            desc="Fetching pages",
+            disable=not show_progress,
+        )
+    books = list(chain(first_books, chain.from_iterable(results)))
     return Library(userId=user_id, books=books)
@@ -2,22 +2,27 @@
 
 from datetime import date
 from functools import cached_property
-from typing import Literal, Self
+from typing import NamedTuple, Self
 
 from pandas import DataFrame
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
-class _Series(BaseModel):
-    name: str = Field(title="Name", description="The name of the series.")
-    entry: float = Field(
-        title="Series Entry",
-        description="The entry of the book in that series.",
-        examples=[1, 2, 2.5],
-    )
+class _Series(NamedTuple):
+    """
+    A parsed series name and entry.
+
+    Only used in passing while a row is parsed, so it is a plain tuple rather
+    than a validated model.
+    """
+
+    name: str
+    entry: float
 
 
 class Book(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     title: str = Field(title="Title", description="The title of the book.")
     authorName: str = Field(
         title="Author Name", description="The name of the author."
@@ -32,10 +37,12 @@ class Book(BaseModel):
         description="The date that the user finished the book.",
         default=None,
     )
-    userRating: Literal[1, 2, 3, 4, 5] | None = Field(
+    userRating: int | None = Field(
         title="User Rating",
         description="The rating that the user gave the book.",
         default=None,
+        ge=1,
+        le=5,
     )
     userReview: str | None = Field(
         title="User Review",
@@ -60,7 +67,7 @@ class Book(BaseModel):
         Validates that if a seriesName exists, a seriesEntry must also exist.
         """
 
-        if bool(self.seriesName) != bool(self.seriesEntry):
+        if (self.seriesName is None) != (self.seriesEntry is None):
             err = "seriesName and seriesEntry must be provided together."
             raise ValueError(err)
         return self
@@ -74,7 +81,7 @@ class Book(BaseModel):
             (title) (series) by (authorName)
         """
         title = f"{self.title} "
-        if self.seriesName and self.seriesEntry:
+        if self.seriesName is not None and self.seriesEntry is not None:
             series_entry = (
                 int(self.seriesEntry)
                 if self.seriesEntry.is_integer()
@@ -85,6 +92,12 @@ class Book(BaseModel):
         return title
 
 
+# Book's fields are fixed at class creation, so their names and column headers
+# are read from model_fields once rather than on every dataframe build.
+_BOOK_FIELD_NAMES = tuple(Book.model_fields)
+_BOOK_HEADERS = tuple(field.title for field in Book.model_fields.values())
+
+
 class Library(BaseModel):
     userId: int = Field(
         title="User ID", description="The Goodreads user ID for the library."
@@ -101,13 +114,11 @@ class Library(BaseModel):
         Returns:
             Pandas dataframe where the headers correspond to the field titles.
         """
-        field_titles = {
-            name: field.title for name, field in Book.model_fields.items()
+        columns = {
+            header: [getattr(book, name) for book in self.books]
+            for name, header in zip(
+                _BOOK_FIELD_NAMES, _BOOK_HEADERS, strict=True
+            )
         }
 
-        records = []
-        for book in self.books:
-            raw = book.model_dump()
-            records.append({field_titles[k]: v for k, v in raw.items()})
-
-        return DataFrame(records).replace({float("nan"): None})
+        return DataFrame(columns).replace({float("nan"): None})
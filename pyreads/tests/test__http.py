@@ -1,23 +1,71 @@
 """Tests for the _http module."""
 
-from collections.abc import Generator
-
-from httpx import Client, HTTPStatusError
-from pytest import fixture, raises
-
-from pyreads._http import _fetch_books_page, _fetch_html, _format_goodreads_url
+from asyncio import get_running_loop, run
+from collections.abc import Callable, Generator
+from os import utime
+from pathlib import Path
+from typing import Any
+
+from httpx import (
+    AsyncClient,
+    Client,
+    HTTPStatusError,
+    MockTransport,
+    Request,
+    Response,
+)
+from pytest import MonkeyPatch, fixture, mark, raises
+
+from pyreads import _http
+from pyreads._http import (
+    _cache_path,
+    _default_cache_dir,
+    _fetch_books_page,
+    _fetch_html,
+    _fetch_html_async,
+    _format_goodreads_url,
+    _read_cached_html,
+    _write_cached_html,
+)
 from pyreads.models import Book
 
 # --- Fixtures -----------------------------------------------------------------
 
+_INPUT_HTML = (
+    Path(__file__).parent / "test_inputs" / "input.html"
+).read_bytes()
+
+# Checked in order, so more specific prefixes must come first.
+_ROUTES = (
+    ("https://example.com/bad", 404, b""),
+    ("https://www.goodreads.com/review/list/", 200, _INPUT_HTML),
+    ("https://example.com", 200, b"<html></html>"),
+)
+
+
+def _route(request: Request) -> Response:
+    """Return a canned response for the first matching URL prefix."""
+    url = str(request.url)
+    for prefix, status_code, content in _ROUTES:
+        if url.startswith(prefix):
+            return Response(status_code, content=content)
+    return Response(404)
+
 
 @fixture
 def mock_client() -> Generator[Client, None, None]:
-    """Create a mock HTTPX client."""
-    with Client() as client:
+    """Create an HTTPX client that serves canned responses offline."""
+    with Client(transport=MockTransport(_route)) as client:
         yield client
 
 
+@fixture
+def cache_dir(tmp_path: Path, monkeypatch: MonkeyPatch) -> Path:
+    """Point the on-disk HTML cache at a temporary directory."""
+    monkeypatch.setattr(_http, "_CACHE_DIR", tmp_path)
+    return tmp_path
+
+
 # --- _format_goodreads_url Tests ---------------------------------------------
 
 
@@ -26,7 +74,8 @@ def test_format_goodreads_url() -> None:
     user_id = 12345
     page = 2
     expected_url = (
-        "https://www.goodreads.com/review/list/12345?page=2&shelf=read"
+        "https://www.goodreads.com/review/list/12345"
+        "?page=2&shelf=read&per_page=100"
     )
     assert _format_goodreads_url(user_id, page) == expected_url
 
@@ -49,6 +98,119 @@ def test_fetch_html_failure(mock_client: Client) -> None:
         _fetch_html(mock_client, url)
 
 
+# --- Cache Tests -------------------------------------------------------------
+
+
+def test_cache_round_trip(cache_dir: Path) -> None:
+    """Test that cached HTML is read back for the same URL."""
+    url = "https://example.com/cached"
+    assert _read_cached_html(url) is None
+
+    _write_cached_html(url, b"<html></html>")
+    assert _cache_path(url).parent == cache_dir
+    assert _read_cached_html(url) == b"<html></html>"
+
+
+@mark.usefixtures("cache_dir")
+def test_cache_expired() -> None:
+    """Test that entries older than the TTL are ignored."""
+    url = "https://example.com/expired"
+    _write_cached_html(url, b"<html></html>")
+    utime(_cache_path(url), (0, 0))
+    assert _read_cached_html(url) is None
+
+
+@mark.usefixtures("cache_dir")
+def test_fetch_html_uses_cache(mock_client: Client) -> None:
+    """Test that a cached page is returned without a request."""
+    url = "https://example.com/never-requested"
+    _write_cached_html(url, b"<html>cached</html>")
+    assert _fetch_html(mock_client, url, cache=True) == b"<html>cached</html>"
+
+
+@mark.usefixtures("cache_dir")
+def test_cache_file_removed_while_reading(monkeypatch: MonkeyPatch) -> None:
+    """Test that a cache file vanishing after its stat is a cache miss."""
+    url = "https://example.com/removed"
+    _write_cached_html(url, b"<html></html>")
+
+    def removed(path: Path) -> bytes:
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(Path, "read_bytes", removed)
+    assert _read_cached_html(url) is None
+
+
+def test_cache_write_failure_removes_temporary_file(
+    cache_dir: Path, monkeypatch: MonkeyPatch
+) -> None:
+    """Test that a failed cache write leaves no temporary file behind."""
+
+    def fail(_self: Path, target: Path) -> Path:
+        raise OSError(target)
+
+    monkeypatch.setattr(Path, "replace", fail)
+    with raises(OSError):
+        _write_cached_html("https://example.com/failed", b"<html></html>")
+    assert list(cache_dir.iterdir()) == []
+
+
+def test_default_cache_dir(tmp_path: Path, monkeypatch: MonkeyPatch) -> None:
+    """Test that the cache follows XDG_CACHE_HOME, defaulting to ~/.cache."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert _default_cache_dir() == tmp_path / "pyreads"
+
+    monkeypatch.delenv("XDG_CACHE_HOME")
+    assert _default_cache_dir() == Path.home() / ".cache" / "pyreads"
+
+
+async def _fetch_cached_async(url: str) -> bytes:
+    """Fetch a URL with the cache enabled through a mock async client."""
+    async with AsyncClient(transport=MockTransport(_route)) as client:
+        return await _fetch_html_async(client, url, cache=True)
+
+
+@mark.usefixtures("cache_dir")
+def test_fetch_html_async_cache() -> None:
+    """Test that async fetches read from and write to the cache."""
+    cached_url = "https://example.com/never-requested"
+    _write_cached_html(cached_url, b"<html>cached</html>")
+    assert run(_fetch_cached_async(cached_url)) == b"<html>cached</html>"
+
+    url = "https://example.com"
+    assert run(_fetch_cached_async(url)) == b"<html></html>"
+    assert _read_cached_html(url) == b"<html></html>"
+
+
+@mark.usefixtures("cache_dir")
+def test_fetch_html_async_cache_off_event_loop(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    """Test that async fetches touch the cache outside the event loop."""
+    calls: list[tuple[str, bool]] = []
+
+    def spy(function: Callable[..., Any]) -> Callable[..., Any]:
+        def wrapper(*args: Any) -> Any:
+            try:
+                get_running_loop()
+            except RuntimeError:
+                calls.append((function.__name__, False))
+            else:
+                calls.append((function.__name__, True))
+            return function(*args)
+
+        return wrapper
+
+    for name in ("_read_cached_html", "_write_cached_html"):
+        monkeypatch.setattr(_http, name, spy(getattr(_http, name)))
+
+    run(_fetch_cached_async("https://example.com"))
+    assert calls == [
+        ("_read_cached_html", False),
+        ("_write_cached_html", False),
+    ]
+
+
 # --- _fetch_books_page Tests -------------------------------------------------
 
 
@@ -60,3 +222,4 @@ def test_fetch_books_page(mock_client: Client) -> None:
     books = _fetch_books_page(mock_client, user_id, page)
     assert isinstance(books, list)
     assert all(isinstance(book, Book) for book in books)
+    assert [book.title for book in books] == ["Watchmen"]
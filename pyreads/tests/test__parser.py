@@ -1,57 +1,65 @@
 """Tests for the _parser module using real Goodreads HTML data."""
 
-from datetime import date, datetime
+from datetime import date
+from functools import lru_cache
+from json import loads
 from pathlib import Path
+from subprocess import run
+from sys import executable
 
-from bs4 import BeautifulSoup, Tag
+from lxml.html import HtmlElement, fromstring
 from pytest import fixture, warns
 
 from pyreads._parser import (
-    _AuthorParser,
-    _DateParser,
-    _PageNumberParser,
     _parse_books_from_html,
+    _parse_date,
+    _parse_first_page,
     _parse_row,
-    _RatingParser,
-    _ReviewParser,
-    _SeriesParser,
-    _TitleParser,
+    _parse_series,
+    _parse_total_pages,
 )
 
 # --- Fixtures -----------------------------------------------------------------
 
 
-@fixture
-def sample_row() -> Tag:
-    """Create a BeautifulSoup Tag from the Watchmen sample row HTML."""
+@lru_cache(maxsize=128)
+def _row(html: str) -> HtmlElement:
+    """Parse a row fragment once; parsers only read it, so it is shared."""
+    return fromstring(html)
+
+
+@fixture(scope="session")
+def input_html() -> bytes:
+    """Return the raw HTML bytes from test_inputs/input.html."""
     html_path = Path(__file__).parent / "test_inputs" / "input.html"
-    html_content: str = html_path.read_text(encoding="utf-8")
-    soup = BeautifulSoup(html_content, "html.parser")
+    return html_path.read_bytes()
 
-    row = soup.find("tr")
-    assert row is not None
-    assert isinstance(row, Tag)
 
-    return row
+@fixture(scope="module")
+def sample_row(input_html: bytes) -> HtmlElement:
+    """
+    Create an lxml element from the Watchmen sample row HTML.
 
+    Parsers only read the row, so one element is shared across the module.
+    """
+    doc = fromstring(input_html.decode("utf-8"))
 
-@fixture
-def input_html() -> str:
-    """Return the raw HTML from test_inputs/input.html."""
-    html_path = Path(__file__).parent / "test_inputs" / "input.html"
-    return html_path.read_text(encoding="utf-8")
+    row = doc.find(".//tr") if doc.tag != "tr" else doc
+    assert row is not None
 
+    return row
 
-# --- AuthorParser Tests ------------------------------------------------------
 
+# --- Author Tests ------------------------------------------------------------
 
-def test_author_parser_success(sample_row: Tag) -> None:
-    assert _AuthorParser.parse(sample_row) == "Moore, Alan"
+
+def test_author_parser_success(sample_row: HtmlElement) -> None:
+    assert _parse_row(sample_row)["authorName"] == "Moore, Alan"
 
 
 def test_author_parser_missing_cell() -> None:
-    row: Tag = BeautifulSoup("<tr></tr>", "html.parser").find("tr")  # type: ignore
-    assert _AuthorParser.parse(row) is None
+    row = _row("<tr></tr>")
+    assert _parse_row(row)["authorName"] is None
 
 
 def test_author_parser_missing_link() -> None:
@@ -59,34 +67,28 @@ def test_author_parser_missing_link() -> None:
         '<tr><td class="field author">'
         '<div class="value">No Link</div></td></tr>'
     )
-    row: Tag = BeautifulSoup(
-        tag,
-        "html.parser",
-    ).find("tr")  # type: ignore
-    assert _AuthorParser.parse(row) is None
+    row = _row(tag)
+    assert _parse_row(row)["authorName"] is None
 
 
-# --- TitleParser Tests -------------------------------------------------------
+# --- Title Tests -------------------------------------------------------------
 
 
-def test_title_parser_success(sample_row: Tag) -> None:
-    assert _TitleParser.parse(sample_row) == "Watchmen"
+def test_title_parser_success(sample_row: HtmlElement) -> None:
+    assert _parse_row(sample_row)["title"] == "Watchmen"
 
 
 def test_title_parser_missing_cell() -> None:
-    row: Tag = BeautifulSoup("<tr></tr>", "html.parser").find("tr")  # type: ignore
-    assert _TitleParser.parse(row) is None
+    row = _row("<tr></tr>")
+    assert _parse_row(row)["title"] is None
 
 
 def test_title_parser_missing_link() -> None:
     tag = (
         '<tr><td class="field title"><div class="value">No Link</div></td></tr>'
     )
-    row: Tag = BeautifulSoup(
-        tag,
-        "html.parser",
-    ).find("tr")  # type: ignore
-    assert _TitleParser.parse(row) is None
+    row = _row(tag)
+    assert _parse_row(row)["title"] is None
 
 
 def test_title_parser_empty_link() -> None:
@@ -99,40 +101,38 @@ def test_title_parser_empty_link() -> None:
         </td>
     </tr>
     """
-    row: Tag = BeautifulSoup(html, "html.parser").find("tr")  # type: ignore
-    assert _TitleParser.parse(row) is None
+    row = _row(html)
+    assert _parse_row(row)["title"] is None
 
 
-# --- PageNumberParser Tests --------------------------------------------------
+# --- Page Number Tests -------------------------------------------------------
 
 
-def test_page_number_parser_success(sample_row: Tag) -> None:
-    assert _PageNumberParser.parse(sample_row) == 416
+def test_page_number_parser_success(sample_row: HtmlElement) -> None:
+    assert _parse_row(sample_row)["numberOfPages"] == 416
 
 
 def test_page_number_parser_missing_cell() -> None:
-    row: Tag = BeautifulSoup("<tr></tr>", "html.parser").find("tr")  # type: ignore
-    assert _PageNumberParser.parse(row) is None
+    row = _row("<tr></tr>")
+    assert _parse_row(row)["numberOfPages"] is None
 
 
 def test_page_number_parser_missing_value() -> None:
-    row: Tag = BeautifulSoup(
-        '<tr><td class="field num_pages"></td></tr>', "html.parser"
-    ).find("tr")  # type: ignore
-    assert _PageNumberParser.parse(row) is None
+    row = _row('<tr><td class="field num_pages"></td></tr>')
+    assert _parse_row(row)["numberOfPages"] is None
 
 
-# --- RatingParser Tests ------------------------------------------------------
+# --- Rating Tests ------------------------------------------------------------
 
 
-def test_rating_parser_success(sample_row: Tag) -> None:
+def test_rating_parser_success(sample_row: HtmlElement) -> None:
     # "it was amazing" → 5 stars
-    assert _RatingParser.parse(sample_row) == 5
+    assert _parse_row(sample_row)["userRating"] == 5
 
 
 def test_rating_parser_missing_cell() -> None:
-    row: Tag = BeautifulSoup("<tr></tr>", "html.parser").find("tr")  # type: ignore
-    assert _RatingParser.parse(row) is None
+    row = _row("<tr></tr>")
+    assert _parse_row(row)["userRating"] is None
 
 
 def test_rating_parser_no_stars() -> None:
@@ -140,40 +140,37 @@ def test_rating_parser_no_stars() -> None:
         '<tr><td class="field rating">'
         '<div class="value">No stars</div></td></tr>'
     )
-    row: Tag = BeautifulSoup(
-        tag,
-        "html.parser",
-    ).find("tr")  # type: ignore
-    assert _RatingParser.parse(row) is None
+    row = _row(tag)
+    assert _parse_row(row)["userRating"] is None
 
 
-# --- ReviewParser Tests ------------------------------------------------------
+# --- Review Tests ------------------------------------------------------------
 
 
-def test_review_parser_success(sample_row: Tag) -> None:
-    text: str | None = _ReviewParser.parse(sample_row)
+def test_review_parser_success(sample_row: HtmlElement) -> None:
+    text: str | None = _parse_row(sample_row)["userReview"]
     assert text is not None
     assert "Too many characters to keep track of" in text
 
 
 def test_review_parser_missing_span() -> None:
-    row: Tag = BeautifulSoup("<tr></tr>", "html.parser").find("tr")  # type: ignore
-    assert _ReviewParser.parse(row) is None
+    row = _row("<tr></tr>")
+    assert _parse_row(row)["userReview"] is None
 
 
-# --- DateParser Tests --------------------------------------------------------
+# --- Date Tests --------------------------------------------------------------
 
 
-def test_date_parser_success(sample_row: Tag) -> None:
-    result: datetime | None = _DateParser.parse(sample_row)
+def test_date_parser_success(sample_row: HtmlElement) -> None:
+    result: date | None = _parse_row(sample_row)["dateRead"]
     assert result is not None
     assert result.year == 2009
     assert result.month == 12
 
 
 def test_date_parser_missing_cell() -> None:
-    row: Tag = BeautifulSoup("<tr></tr>", "html.parser").find("tr")  # type: ignore
-    assert _DateParser.parse(row) is None
+    row = _row("<tr></tr>")
+    assert _parse_row(row)["dateRead"] is None
 
 
 def test_date_parser_invalid_format() -> None:
@@ -186,8 +183,8 @@ def test_date_parser_invalid_format() -> None:
         </td>
     </tr>
     """
-    row: Tag = BeautifulSoup(html, "html.parser").find("tr")  # type: ignore
-    assert _DateParser.parse(row) is None
+    row = _row(html)
+    assert _parse_row(row)["dateRead"] is None
 
 
 def test_date_parser_no_date() -> None:
@@ -200,15 +197,32 @@ def test_date_parser_no_date() -> None:
         </td>
     </tr>
     """
-    row: Tag = BeautifulSoup(html, "html.parser").find("tr")  # type: ignore
-    assert _DateParser.parse(row) is None
+    row = _row(html)
+    assert _parse_row(row)["dateRead"] is None
+
 
+def test_parse_date_formats() -> None:
+    assert _parse_date("Dec 14, 2009") == date(2009, 12, 14)
+    assert _parse_date("Dec 2009") == date(2009, 12, 1)
+    assert _parse_date("dec 14, 2009") == date(2009, 12, 14)
+    assert _parse_date("Invalid Date") is None
+    assert _parse_date("Feb 30, 2009") is None
+    assert _parse_date("Dec 14 2009") is None
+    assert _parse_date("Dec 14, 09") is None
+    assert _parse_date("Dec 1_4, 2009") is None
+    assert _parse_date("Dec +14, 2009") is None
+    assert _parse_date("Dec 014, 2009") is None
+    assert _parse_date("Dec 14, 20_09") is None
+    assert _parse_date("Dec -2009") is None
+    assert _parse_date("Dec 12009") is None
+    assert _parse_date("Dec 0, 2009") is None
 
-# --- SeriesParser Tests ------------------------------------------------------
 
+# --- Series Tests ------------------------------------------------------------
 
-def test_series_parser_none_in_sample(sample_row: Tag) -> None:
-    assert _SeriesParser.parse(sample_row) is None
+
+def test_series_parser_none_in_sample(sample_row: HtmlElement) -> None:
+    assert _parse_row(sample_row)["series"] is None
 
 
 def test_series_parser_dark_grey_text() -> None:
@@ -224,8 +238,8 @@ def test_series_parser_dark_grey_text() -> None:
         </td>
     </tr>
     """
-    row: Tag = BeautifulSoup(html, "html.parser").find("tr")  # type: ignore
-    result = _SeriesParser.parse(row)
+    row = _row(html)
+    result = _parse_row(row)["series"]
     assert result is not None
     assert result.name == "Series Name"
     assert result.entry == 1
@@ -244,16 +258,16 @@ def test_series_parser_vol_pattern() -> None:
         </td>
     </tr>
     """
-    row: Tag = BeautifulSoup(html, "html.parser").find("tr")  # type: ignore
-    result = _SeriesParser.parse(row)
+    row = _row(html)
+    result = _parse_row(row)["series"]
     assert result is not None
     assert result.name == "Series Name"
     assert result.entry == 2
 
 
 def test_series_parser_missing_title_cell() -> None:
-    row: Tag = BeautifulSoup("<tr></tr>", "html.parser").find("tr")  # type: ignore
-    assert _SeriesParser.parse(row) is None
+    row = _row("<tr></tr>")
+    assert _parse_row(row)["series"] is None
 
 
 def test_series_parser_no_link() -> None:
@@ -268,14 +282,25 @@ def test_series_parser_no_link() -> None:
         </td>
     </tr>
     """
-    row: Tag = BeautifulSoup(html, "html.parser").find("tr")  # type: ignore
-    assert _SeriesParser.parse(row) is None
+    row = _row(html)
+    assert _parse_row(row)["series"] is None
+
+
+def test_parse_series_book_pattern() -> None:
+    result = _parse_series("(Series Name Book 3)")
+    assert result is not None
+    assert result.name == "Series Name"
+    assert result.entry == 3
+
+
+def test_parse_series_without_name() -> None:
+    assert _parse_series("Vol. 7") is None
 
 
 # --- Integration Tests -------------------------------------------------------
 
 
-def test_all_parsers_work_with_sample(sample_row: Tag) -> None:
+def test_all_parsers_work_with_sample(sample_row: HtmlElement) -> None:
     results = _parse_row(sample_row)
     assert results["authorName"] == "Moore, Alan"
     assert results["title"] == "Watchmen"
@@ -301,8 +326,9 @@ def test_parse_row_series_attribute() -> None:
         </td>
     </tr>
     """
-    row: Tag = BeautifulSoup(html, "html.parser").find("tr")  # type: ignore
+    row = _row(html)
     result = _parse_row(row)
+    assert result["title"] == "Title"
     assert result["seriesName"] == "Series Name"
     assert result["seriesEntry"] == 1
 
@@ -310,7 +336,21 @@ def test_parse_row_series_attribute() -> None:
 # --- _parse_books_from_html Tests --------------------------------------------
 
 
-def test_parse_books_from_html(input_html: str) -> None:
+def test_parse_books_from_html_utf8() -> None:
+    html = """
+    <table>
+        <tr id="review_1">
+            <td class="field title"><a href="/book/show/1">Café</a></td>
+            <td class="field author"><a href="/author/show/1">Brontë</a></td>
+        </tr>
+    </table>
+    """
+    books = _parse_books_from_html(html.encode())
+    assert books[0].title == "Café"
+    assert books[0].authorName == "Brontë"
+
+
+def test_parse_books_from_html(input_html: bytes) -> None:
     books = _parse_books_from_html(input_html)
     assert len(books) == 1
 
@@ -346,5 +386,99 @@ def test_parse_books_from_html_missing_title() -> None:
     </html>
     """
     with warns(UserWarning):
-        books = _parse_books_from_html(html)
+        books = _parse_books_from_html(html.encode())
         assert len(books) == 0
+
+
+def test_parse_books_from_html_title_without_link() -> None:
+    html = """
+    <table>
+        <tr id="review_1">
+            <td class="field title"><div class="value">No Link</div></td>
+            <td class="field author"><a href="/author/show/1">Moore</a></td>
+        </tr>
+    </table>
+    """
+    with warns(UserWarning):
+        assert _parse_books_from_html(html.encode()) == []
+
+
+# Parses input.html plus a row without a title and prints the resulting books
+# and warnings, so the validated and -O paths can be compared.
+_PARSE_SCRIPT = """
+import json, sys, warnings
+from pathlib import Path
+from pyreads._parser import _parse_books_from_html
+
+html = (
+    b"<table>"
+    + Path(sys.argv[1]).read_bytes()
+    + b'<tr id="review_1"><td class="field author"><a>Moore</a></td></tr>'
+    + b"</table>"
+)
+with warnings.catch_warnings(record=True) as caught:
+    warnings.simplefilter("always")
+    books = _parse_books_from_html(html)
+print(json.dumps({
+    "debug": __debug__,
+    "books": [book.model_dump(mode="json") for book in books],
+    "warnings": [(w.category.__name__, str(w.message)) for w in caught],
+}))
+"""
+
+
+def test_parse_books_from_html_optimized_matches_validated() -> None:
+    input_path = Path(__file__).parent / "test_inputs" / "input.html"
+
+    def parse(*flags: str) -> dict:
+        result = run(  # noqa: S603
+            [executable, *flags, "-c", _PARSE_SCRIPT, str(input_path)],
+            capture_output=True,
+            check=True,
+            cwd=Path(__file__).parents[2],
+            text=True,
+        )
+        return loads(result.stdout)
+
+    validated, optimized = parse(), parse("-O")
+    assert validated.pop("debug") and not optimized.pop("debug")
+    assert [book["title"] for book in validated["books"]] == ["Watchmen"]
+    assert validated["warnings"] == [
+        ["UserWarning", "Missing title or author in review_1"]
+    ]
+    assert optimized == validated
+
+
+# --- Pagination Tests --------------------------------------------------------
+
+
+def test_parse_total_pages() -> None:
+    html = """
+    <div id="reviewPagination">
+        <em class="current">1</em>
+        <a href="?page=2">2</a>
+        <a href="?page=3">3</a>
+        <a class="next_page" href="?page=2">next »</a>
+    </div>
+    """
+    assert _parse_total_pages(fromstring(html)) == 3
+
+
+def test_parse_total_pages_ignores_non_ascii_digits() -> None:
+    html = """
+    <div id="reviewPagination">
+        <a href="?page=2">2</a>
+        <a href="#">²</a>
+    </div>
+    """
+    assert _parse_total_pages(fromstring(html)) == 2
+
+
+def test_parse_total_pages_without_pagination() -> None:
+    assert _parse_total_pages(fromstring("<table></table>")) == 1
+
+
+def test_parse_first_page(input_html: bytes) -> None:
+    books, total_pages = _parse_first_page(input_html)
+    assert [book.title for book in books] == ["Watchmen"]
+    assert total_pages == 1
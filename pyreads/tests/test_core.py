@@ -1,8 +1,193 @@
-"""Integration test for the core module."""
+"""Tests for the core module."""
 
-from pyreads.core import fetch_library
+from asyncio import run, sleep
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any
 
+from httpx import AsyncClient, Client, MockTransport, Request, Response
+from pytest import MonkeyPatch, fixture, mark
 
+from pyreads import _http, core
+from pyreads.core import fetch_library, fetch_library_async
+
+# --- Helpers ------------------------------------------------------------------
+
+
+def _shelf_page(page: int, total_pages: int) -> bytes:
+    """Return a shelf page with two books and pagination to `total_pages`."""
+    rows = "".join(
+        f'<tr id="review_{page}_{entry}">'
+        f'<td class="field title"><a href="#">Book {page}.{entry}</a></td>'
+        '<td class="field author"><a href="#">Author</a></td>'
+        "</tr>"
+        for entry in (1, 2)
+    )
+    links = "".join(
+        f'<a href="?page={number}">{number}</a>'
+        for number in range(2, total_pages + 1)
+    )
+    return (
+        f"<html><body><table>{rows}</table>"
+        f'<div id="reviewPagination">{links}</div></body></html>'
+    ).encode()
+
+
+def _shelf_titles(total_pages: int) -> list[str]:
+    """Return every book title of a shelf, in page order."""
+    return [
+        f"Book {page}.{entry}"
+        for page in range(1, total_pages + 1)
+        for entry in (1, 2)
+    ]
+
+
+class _Shelf:
+    """A fake Goodreads shelf that records the pages requested from it."""
+
+    def __init__(self, total_pages: int) -> None:
+        self.total_pages = total_pages
+        self.requested: list[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def handle(self, request: Request) -> Response:
+        page = int(request.url.params["page"])
+        self.requested.append(page)
+        return Response(200, content=_shelf_page(page, self.total_pages))
+
+    async def handle_async(self, request: Request) -> Response:
+        # Hold each request open briefly so concurrent requests overlap
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await sleep(0.01)
+        self.in_flight -= 1
+        return self.handle(request)
+
+
+# --- Fixtures -----------------------------------------------------------------
+
+
+@fixture
+def serve_shelf(monkeypatch: MonkeyPatch) -> Callable[[int], _Shelf]:
+    """Serve a fake shelf of the given size to the clients core opens."""
+
+    def serve(total_pages: int) -> _Shelf:
+        shelf = _Shelf(total_pages)
+        monkeypatch.setattr(
+            core,
+            "Client",
+            partial(Client, transport=MockTransport(shelf.handle)),
+        )
+        monkeypatch.setattr(
+            core,
+            "AsyncClient",
+            partial(AsyncClient, transport=MockTransport(shelf.handle_async)),
+        )
+        return shelf
+
+    return serve
+
+
+@fixture
+def process_pools(monkeypatch: MonkeyPatch) -> list[ProcessPoolExecutor]:
+    """Record every process pool that core starts."""
+    pools: list[ProcessPoolExecutor] = []
+
+    def record(*args: Any, **kwargs: Any) -> ProcessPoolExecutor:
+        pool = ProcessPoolExecutor(*args, **kwargs)
+        pools.append(pool)
+        return pool
+
+    monkeypatch.setattr(core.concurrent.futures, "ProcessPoolExecutor", record)
+    return pools
+
+
+# --- fetch_library Tests ------------------------------------------------------
+
+
+# pytest-xdist workers run their own threads, so forking the pool warns there
+@mark.filterwarnings(
+    "ignore:This process .* is multi-threaded:DeprecationWarning"
+)
+def test_fetch_library_parses_in_processes(
+    serve_shelf: Callable[[int], _Shelf],
+    process_pools: list[ProcessPoolExecutor],
+) -> None:
+    """Test that large libraries are parsed in processes, in page order."""
+    serve_shelf(10)
+
+    library = fetch_library(1, show_progress=False, processes=2)
+
+    assert len(process_pools) == 1
+    assert [book.title for book in library.books] == _shelf_titles(10)
+
+
+def test_fetch_library_small_library_parses_in_threads(
+    serve_shelf: Callable[[int], _Shelf],
+    process_pools: list[ProcessPoolExecutor],
+) -> None:
+    """Test that libraries of 8 pages or fewer skip the process pool."""
+    serve_shelf(8)
+
+    library = fetch_library(1, show_progress=False, processes=2)
+
+    assert process_pools == []
+    assert [book.title for book in library.books] == _shelf_titles(8)
+
+
+def test_fetch_library_cache(
+    serve_shelf: Callable[[int], _Shelf],
+    monkeypatch: MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Test that cached pages are reused by both sync and async fetches."""
+    monkeypatch.setattr(_http, "_CACHE_DIR", tmp_path)
+    shelf = serve_shelf(3)
+
+    first = fetch_library(1, show_progress=False, cache=True)
+    second = fetch_library(1, show_progress=False, cache=True)
+    third = run(fetch_library_async(1, show_progress=False, cache=True))
+
+    assert sorted(shelf.requested) == [1, 2, 3]
+    for library in (first, second, third):
+        assert [book.title for book in library.books] == _shelf_titles(3)
+
+
+# --- fetch_library_async Tests ------------------------------------------------
+
+
+def test_fetch_library_async_pages_in_order(
+    serve_shelf: Callable[[int], _Shelf],
+) -> None:
+    """Test that async fetches return every page's books in page order."""
+    shelf = serve_shelf(12)
+
+    library = run(fetch_library_async(1, show_progress=False))
+
+    assert [book.title for book in library.books] == _shelf_titles(12)
+    assert shelf.max_in_flight > 1
+
+
+def test_fetch_library_async_limits_requests_in_flight(
+    serve_shelf: Callable[[int], _Shelf],
+) -> None:
+    """Test that at most `workers` page requests are in flight at once."""
+    shelf = serve_shelf(12)
+
+    library = run(fetch_library_async(1, workers=3, show_progress=False))
+
+    assert [book.title for book in library.books] == _shelf_titles(12)
+    assert sorted(shelf.requested) == list(range(1, 13))
+    assert shelf.max_in_flight == 3
+
+
+# --- Integration Tests --------------------------------------------------------
+
+
+@mark.integration
 def test_fetch_library_integration() -> None:
     """Integration test for fetch_library using an arbitrary user ID."""
     user_id = 110430434
@@ -23,3 +208,17 @@ def test_fetch_library_integration() -> None:
         assert isinstance(book.userRating, int)
         assert book.userRating >= 0
         assert book.userRating <= 5
+
+
+@mark.integration
+def test_fetch_library_async_integration() -> None:
+    """Integration test for fetch_library_async using the same user ID."""
+    user_id = 110430434
+
+    library = run(fetch_library_async(user_id))
+
+    assert library.userId == user_id
+    assert len(library.books) > 0
+    for book in library.books:
+        assert isinstance(book.title, str)
+        assert isinstance(book.authorName, str)
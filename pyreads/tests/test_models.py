@@ -130,3 +130,29 @@ def test_series_name_and_entry_validation() -> None:
     # Case 4: Neither seriesName nor seriesEntry is provided (valid case)
     model = Book(**required_attrs, seriesName=None, seriesEntry=None)  # type: ignore
     assert model is not None
+
+    # Case 5: A prequel numbered 0 is still part of its series (valid case)
+    model = Book(**required_attrs, seriesName="Series A", seriesEntry=0)  # type: ignore
+    assert "(Series A, #0)" in model.full_title
+
+
+# --- User Rating Validation Tests ---------------------------------------------
+def test_user_rating_bounds() -> None:
+    """Test that userRating only accepts whole stars from 1 to 5."""
+
+    for rating in (0, 6):
+        with raises(ValueError, match="userRating"):
+            Book(title="", authorName="", userRating=rating)
+
+    assert Book(title="", authorName="", userRating=5).userRating == 5
+
+
+# --- Immutability Tests -------------------------------------------------------
+def test_book_is_frozen(example_book: Book) -> None:
+    """Test that books are immutable and hashable."""
+
+    with raises(ValueError, match="frozen"):
+        example_book.title = "Another Title"
+
+    assert example_book.full_title == example_book.full_title
+    assert len({example_book, example_book.model_copy()}) == 1
@@ -1,3 +1,3 @@
 #!/bin/sh
 uv sync --dev
-uv run pytest
+uv run pytest -n auto